@@ -1,16 +1,68 @@
 import json
 import os
+import gzip
+import lzma
+import hashlib
+import functools
+import re
+import zlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox, font
-from datetime import datetime
+from datetime import datetime, timedelta
 import random
+import threading
+import queue
+import time
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def search_records(records, query):
+    results = []
+    # Copy the items first so an edit on another thread cannot break the loop
+    for sid, info in list(records.items()):
+        if (query.lower() in info['name'].lower() or 
+            query.lower() in sid.lower() or 
+            query.lower() in info.get('email', '').lower() or
+            query in info.get('phone', '')):
+            results.append((sid, info))
+    return results
+
+
+# Shards parsed by this process, keyed by path and kept until the shard's
+# generation changes. Pool workers keep theirs between searches, so repeated
+# searches skip the JSON parsing.
+_shard_cache = {}
+
+def search_shard(path, generation, query, ids_only=False):
+    cached = _shard_cache.get(path)
+    if cached is None or cached[0] != generation:
+        records = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                records = json.load(f)
+        cached = (generation, records)
+        _shard_cache[path] = cached
+    results = search_records(cached[1], query)
+    if ids_only:
+        # The caller already has these records, so only send the IDs back
+        return [sid for sid, info in results]
+    return results
 
 
 class StudentManager:
     def __init__(self, filename="students.json"):
         self.filename = filename
-        self.students = self.load_data()
+        # Held by every change to students, including a restore being swapped in
+        self.lock = threading.RLock()
+        self.version = 0
+        self._loaded = None
+        self.reload()
     
     def load_data(self):
         if os.path.exists(self.filename):
@@ -18,51 +70,901 @@ class StudentManager:
                 return json.load(f)
         return {}
     
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def reload(self, force=False):
+        """Re-read the data if it changed since the last load or save.
+        
+        The version is bumped only after the new data is assigned, so a cache
+        can never store the old data under the new version.
+        """
+        stamp = self._file_stamp()
+        if self.version and not force and stamp == self._loaded:
+            return False
+        self.students = self.load_data()
+        self._loaded = stamp
+        self.version += 1
+        return True
+    
     def save_data(self):
         with open(self.filename, 'w') as f:
             json.dump(self.students, f, indent=2)
+        self._loaded = self._file_stamp()
+        self.version += 1
     
-    def add_student(self, student_id, name, grade, email="", phone=""):
-        self.students[student_id] = {
+    def new_record(self, name, grade, email="", phone="", campus=""):
+        record = {
             "name": name, 
             "grade": grade, 
             "email": email, 
             "phone": phone,
             "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
-        self.save_data()
-        return True
+        if campus:
+            record["campus"] = campus
+        return record
     
-    def update_student(self, student_id, **kwargs):
-        if student_id in self.students:
-            for key, value in kwargs.items():
-                if value:
-                    self.students[student_id][key] = value
-            self.students[student_id]["modified"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def updated_record(self, record, kwargs):
+        # Build a new record rather than editing it in place, so snapshots
+        # taken by background backups never see a half-updated student
+        record = dict(record)
+        for key, value in kwargs.items():
+            if value:
+                record[key] = value
+        record["modified"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return record
+    
+    def add_student(self, student_id, name, grade, email="", phone="", campus=""):
+        with self.lock:
+            self.students[student_id] = self.new_record(name, grade, email, phone, campus)
             self.save_data()
             return True
-        return False
+    
+    def update_student(self, student_id, **kwargs):
+        with self.lock:
+            if student_id in self.students:
+                self.students[student_id] = self.updated_record(self.students[student_id], kwargs)
+                self.save_data()
+                return True
+            return False
     
     def delete_student(self, student_id):
-        if student_id in self.students:
-            del self.students[student_id]
-            self.save_data()
-            return True
-        return False
+        with self.lock:
+            if student_id in self.students:
+                del self.students[student_id]
+                self.save_data()
+                return True
+            return False
+    
+    def prepare_replace(self, students):
+        """Write ``students`` to a temporary file, ready for commit_replace.
+        
+        This does the slow part of replacing the data (e.g. for a restore)
+        and is safe to run off the Tk thread, since it only reads ``students``.
+        """
+        tmp = self.filename + '.restore'
+        with open(tmp, 'w') as f:
+            json.dump(students, f, indent=2)
+        return students, [(tmp, self.filename)]
+    
+    def commit_replace(self, pending):
+        """Swap in data written by prepare_replace. Returns the record count."""
+        students, files = pending
+        with self.lock:
+            for tmp, path in files:
+                os.replace(tmp, path)
+            self.students = students
+            self._loaded = self._file_stamp()
+            self.version += 1
+        return len(students)
     
     def search_students(self, query):
+        return search_records(self.students, query)
+    
+    def all_records(self):
+        return list(self.students.items())
+
+class ShardedStudentManager(StudentManager):
+    """A StudentManager whose roster is split into shard files.
+
+    Records are partitioned by campus, grade or a hash of the student ID.
+    ``roster/manifest.json`` lists the shards with their record counts and a
+    generation number that goes up on every write. Only the shards in the
+    current view are loaded into ``students``, each save rewrites only the
+    shards that changed, and searches over large views fan out across a
+    process pool.
+
+    Assigning a new dict to ``students`` and saving replaces the whole
+    roster, not just the view. That is how a restore is applied.
+    """
+    PARTITIONS = ('campus', 'grade', 'hash')
+
+    def __init__(self, directory="roster", view=None, workers=None, parallel_threshold=50000):
+        self.directory = directory
+        self.manifest_file = os.path.join(directory, "manifest.json")
+        if not os.path.exists(self.manifest_file):
+            raise ValueError(f"No sharded roster found in {directory}")
+        self.view = view
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self._shards = {}
+        self._generations = {}
+        # IDs of shards that are not loaded, for the roster-wide duplicate check
+        self._shard_ids = {}
+        self._id_generations = {}
+        self._dirty = set()
+        self._pools = []
+        self._pool_lock = threading.Lock()
+        self._search_futures = []
+        self.lock = threading.RLock()
+        self.version = 0
+        self._loaded = None
+        self.reload()
+
+    @classmethod
+    def split(cls, students, directory="roster", partition='grade', buckets=16, campuses=None,
+              **kwargs):
+        """Write ``students`` as a new sharded roster and open it.
+
+        ``campuses`` can map student IDs to a campus name, which is stored in
+        the record's ``campus`` field before partitioning.
+        """
+        if partition not in cls.PARTITIONS:
+            raise ValueError(f"Unknown partition: {partition}")
+        students = dict(students)
+        for sid, campus in (campuses or {}).items():
+            if sid in students:
+                students[sid] = dict(students[sid], campus=campus)
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"partition": partition, "buckets": buckets, "shards": {}}
+        cls._write_json(os.path.join(directory, "manifest.json"), manifest)
+        manager = cls(directory, **kwargs)
+        manager.students = students
+        manager.save_data()
+        return manager
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(data))
+        os.replace(tmp, path)
+
+    def shard_key(self, student_id, info):
+        partition = self.manifest['partition']
+        if partition == 'hash':
+            # crc32 rather than hash(), which changes between runs
+            return f"{zlib.crc32(student_id.encode()) % self.manifest['buckets']:02d}"
+        if partition == 'grade':
+            return info.get('grade') or 'Unknown'
+        return info.get('campus') or 'Main'
+
+    def shard_keys(self):
+        return sorted(self.manifest['shards'])
+
+    def _scope(self):
+        if self.view is None:
+            return self.shard_keys()
+        return [key for key in self.view if key in self.manifest['shards']]
+
+    def _in_view(self, key):
+        return self.view is None or key in self.view
+
+    def _path(self, key):
+        return os.path.join(self.directory, self.manifest['shards'][key]['file'])
+
+    def _generation(self, key):
+        return self.manifest['shards'][key].get('generation', 0)
+
+    def _read_shard(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    # Every shard file has a sidecar listing just its student IDs, rewritten
+    # with the shard, so the duplicate-ID check never parses whole shards.
+
+    @staticmethod
+    def _ids_file(path):
+        return os.path.splitext(path)[0] + '.ids'
+
+    @classmethod
+    def _write_shard(cls, path, records, suffix=''):
+        cls._write_json(path + suffix, records)
+        cls._write_json(cls._ids_file(path) + suffix, list(records))
+
+    def _read_ids(self, key):
+        path = self._ids_file(self._path(key))
+        if not os.path.exists(path):
+            # Rosters written before the sidecars existed
+            return list(self._read_shard(key))
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _shard(self, key):
+        """Return the records of one shard, reading the file only when it changed."""
+        if key not in self.manifest['shards']:
+            self._add_shard(self.manifest, key)
+            self._shards[key] = {}
+            self._dirty.add(key)
+            return self._shards[key]
+        if key in self._dirty:
+            return self._shards[key]
+        if key not in self._shards or self._generations.get(key) != self._generation(key):
+            self._shards[key] = self._read_shard(key)
+            self._generations[key] = self._generation(key)
+        return self._shards[key]
+
+    @staticmethod
+    def _add_shard(manifest, key):
+        taken = {shard['file'] for shard in manifest['shards'].values()}
+        slug = re.sub(r'[^\w-]', '_', key) or '_'
+        filename, n = f"shard-{slug}.json", 1
+        while filename in taken:
+            n += 1
+            filename = f"shard-{slug}-{n}.json"
+        manifest['shards'][key] = {"file": filename, "count": 0, "generation": 0}
+
+    def _owner(self, student_id):
+        """Return the key of the shard holding a student ID, or None."""
+        if self.manifest['partition'] == 'hash':
+            key = self.shard_key(student_id, {})
+            if key in self.manifest['shards'] and student_id in self._shard(key):
+                return key
+            return None
+        for key in self.shard_keys():
+            if key in self._shards and (key in self._dirty or
+                                        self._generations.get(key) == self._generation(key)):
+                ids = self._shards[key]
+            else:
+                # Shards outside the view are checked against their ID sidecar
+                if self._id_generations.get(key) != self._generation(key):
+                    self._shard_ids[key] = set(self._read_ids(key))
+                    self._id_generations[key] = self._generation(key)
+                ids = self._shard_ids[key]
+            if student_id in ids:
+                return key
+        return None
+
+    def all_records(self):
+        """Every (student_id, record) pair in the roster, whatever the view."""
+        records = []
+        for key in self.shard_keys():
+            shard = self._shards.get(key)
+            if shard is None or self._generations.get(key) != self._generation(key):
+                shard = self._read_shard(key)
+            records.extend(list(shard.items()))
+        return records
+
+    @classmethod
+    def saved_view(cls, directory="roster"):
+        """The view last saved with ``set_view(..., remember=True)``.
+
+        Without one, this is the first shard, so opening a roster never
+        loads every shard by default.
+        """
+        view_file = os.path.join(directory, "view.json")
+        if os.path.exists(view_file):
+            with open(view_file, 'r') as f:
+                return json.load(f)['view']
+        with open(os.path.join(directory, "manifest.json"), 'r') as f:
+            keys = sorted(json.load(f)['shards'])
+        return keys[:1] or None
+
+    def set_view(self, keys=None, remember=False):
+        """Limit ``students`` to the given shard keys, or every shard with None."""
+        self.view = keys
+        self.reload(force=True)
+        if remember:
+            self._write_json(os.path.join(self.directory, "view.json"), {"view": keys})
+
+    def _file_stamp(self):
+        # Re-read the manifest so shards written by another process are picked up
+        with open(self.manifest_file, 'r') as f:
+            self.manifest = json.load(f)
+        return tuple((key, self._generation(key)) for key in self._scope())
+
+    def load_data(self):
+        students = {}
+        for key in self._scope():
+            students.update(self._shard(key))
+        self._view = students
+        return students
+
+    def save_data(self):
+        if self.students is not self._view:
+            # students was replaced: rebuild every shard from it
+            self.commit_replace(self.prepare_replace(self.students))
+            return
+        if not self._dirty:
+            return
+        for key in sorted(self._dirty):
+            records = self._shards[key]
+            shard = self.manifest['shards'][key]
+            self._write_shard(self._path(key), records)
+            shard['count'] = len(records)
+            shard['generation'] = shard.get('generation', 0) + 1
+            self._generations[key] = shard['generation']
+            if key in self._shard_ids:
+                self._shard_ids[key] = set(records)
+                self._id_generations[key] = shard['generation']
+        self._dirty.clear()
+        self._write_json(self.manifest_file, self.manifest)
+        self._loaded = tuple((key, self._generation(key)) for key in self._scope())
+        self.version += 1
+
+    def prepare_replace(self, students):
+        """Partition ``students`` into temporary shard files, ready for commit_replace.
+
+        This is the slow part of replacing the whole roster (e.g. for a
+        restore) and is safe to run off the Tk thread.
+        """
+        with self.lock:
+            manifest = json.loads(json.dumps(self.manifest))
+        parts = {key: {} for key in manifest['shards']}
+        for sid, info in students.items():
+            key = self.shard_key(sid, info)
+            if key not in parts:
+                self._add_shard(manifest, key)
+                parts[key] = {}
+            parts[key][sid] = info
+        files = []
+        for key, records in parts.items():
+            path = os.path.join(self.directory, manifest['shards'][key]['file'])
+            self._write_shard(path, records, '.restore')
+            files.append((path + '.restore', path))
+            files.append((self._ids_file(path) + '.restore', self._ids_file(path)))
+        return parts, manifest, files
+
+    def commit_replace(self, pending):
+        """Swap in shards written by prepare_replace. Returns the record count."""
+        parts, manifest, files = pending
+        with self.lock:
+            # Empty any shard created after prepare_replace read the manifest
+            for key, shard in self.manifest['shards'].items():
+                if key not in manifest['shards']:
+                    manifest['shards'][key] = dict(shard)
+                    parts[key] = {}
+                    path = os.path.join(self.directory, shard['file'])
+                    self._write_shard(path, {}, '.restore')
+                    files.append((path + '.restore', path))
+                    files.append((self._ids_file(path) + '.restore', self._ids_file(path)))
+            for tmp, path in files:
+                os.replace(tmp, path)
+            for key, shard in manifest['shards'].items():
+                old = self.manifest['shards'].get(key, {})
+                shard['count'] = len(parts[key])
+                shard['generation'] = old.get('generation', 0) + 1
+            self._write_json(self.manifest_file, manifest)
+            self.manifest = manifest
+            
+            scope = self._scope()
+            self._shards = {key: parts[key] for key in scope}
+            self._generations = {key: self._generation(key) for key in scope}
+            self._shard_ids.clear()
+            self._id_generations.clear()
+            self._dirty.clear()
+            self.students = self._view = self.load_data()
+            self._loaded = tuple((key, self._generation(key)) for key in scope)
+            self.version += 1
+        return sum(len(records) for records in parts.values())
+
+    def _move(self, student_id, old_key, record):
+        if old_key is not None:
+            del self._shard(old_key)[student_id]
+            self._dirty.add(old_key)
+        key = self.shard_key(student_id, record)
+        self._shard(key)[student_id] = record
+        self._dirty.add(key)
+        if self._in_view(key):
+            self.students[student_id] = record
+        else:
+            self.students.pop(student_id, None)
+        self.save_data()
+
+    def add_student(self, student_id, name, grade, email="", phone="", campus=""):
+        with self.lock:
+            # IDs must be unique across the roster, not only within the shards in view
+            if self._owner(student_id) is not None:
+                return False
+            self._move(student_id, None, self.new_record(name, grade, email, phone, campus))
+            return True
+
+    def update_student(self, student_id, **kwargs):
+        with self.lock:
+            if student_id in self.students:
+                old = self.students[student_id]
+                self._move(student_id, self.shard_key(student_id, old),
+                           self.updated_record(old, kwargs))
+                return True
+            return False
+
+    def delete_student(self, student_id):
+        with self.lock:
+            if student_id in self.students:
+                key = self.shard_key(student_id, self.students.pop(student_id))
+                del self._shard(key)[student_id]
+                self._dirty.add(key)
+                self.save_data()
+                return True
+            return False
+
+    def _get_pools(self):
+        with self._pool_lock:
+            if not self._pools:
+                # spawn, not fork: forking the Tk process while other threads run is unsafe
+                context = multiprocessing.get_context('spawn')
+                self._pools = [ProcessPoolExecutor(max_workers=1, mp_context=context)
+                               for _ in range(self.workers)]
+            return self._pools
+
+    def search_students(self, query, all_shards=False):
+        """Search the current view, or every shard with ``all_shards``.
+
+        Small searches over loaded shards run here. Larger ones send each
+        shard to a worker process, which keeps the shards it has parsed.
+        This blocks, so the GUI calls it from a worker thread. Starting a new
+        parallel search cancels the shard scans still queued for the previous
+        one, whose call then raises CancelledError.
+        """
+        scope = self.shard_keys() if all_shards else self._scope()
+        loaded = {key: self._shards.get(key) for key in scope}
+        if (all(shard is not None for shard in loaded.values()) and
+                sum(len(shard) for shard in loaded.values()) < self.parallel_threshold):
+            return [result for key in scope for result in search_records(loaded[key], query)]
+        
+        pools = self._get_pools()
+        futures = []
+        for key in scope:
+            # A shard always goes to the same worker, so it is parsed and cached only once
+            pool = pools[zlib.crc32(key.encode()) % len(pools)]
+            ids_only = loaded[key] is not None
+            futures.append((key, pool.submit(search_shard, self._path(key), self._generation(key),
+                                             query, ids_only)))
+        with self._pool_lock:
+            for future in self._search_futures:
+                future.cancel()
+            self._search_futures = [future for key, future in futures]
         results = []
-        for sid, info in self.students.items():
-            if (query.lower() in info['name'].lower() or 
-                query.lower() in sid.lower() or 
-                query.lower() in info.get('email', '').lower() or
-                query in info.get('phone', '')):
-                results.append((sid, info))
+        for key, future in futures:
+            shard = loaded[key]
+            if shard is None:
+                results.extend(future.result())
+            else:
+                results.extend((sid, shard[sid]) for sid in future.result() if sid in shard)
         return results
 
+    def close(self):
+        with self._pool_lock:
+            for pool in self._pools:
+                pool.shutdown(cancel_futures=True)
+            self._pools = []
+            self._search_futures = []
+
+class StudentAnalytics:
+    """Enrollment reports computed from the StudentManager data.
+
+    Timestamps are parsed into arrays once per data version and every
+    aggregation is vectorized with NumPy when it is installed (plain
+    Python otherwise). Results are cached until the next load or save.
+    """
+    PERIODS = ('day', 'week', 'month')
+    FIELDS = ('created', 'modified')
+    # NumPy also parses partial and ISO dates, so both paths check this exact shape first
+    TIMESTAMP = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}')
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._lock = threading.Lock()
+        self._version = None
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        version = self.manager.version
+        with self._lock:
+            if self._version != version:
+                self._cache = {}
+                self._version = version
+            elif key in self._cache:
+                return self._cache[key]
+        value = compute()
+        with self._lock:
+            if self._version == version:
+                self._cache[key] = value
+        return value
+
+    def _check(self, period, field):
+        if period not in self.PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        if field not in self.FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+
+    @classmethod
+    def _valid(cls, value):
+        return isinstance(value, str) and cls.TIMESTAMP.fullmatch(value) is not None
+
+    @classmethod
+    def _parse(cls, value):
+        if not cls._valid(value):
+            return None
+        try:
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+
+    def _columns(self, field):
+        def compute():
+            # list() copies the values in one step, so a save from the GUI
+            # thread cannot change the dict while we iterate it here
+            records = list(self.manager.students.values())
+            stamps = [info.get(field) for info in records]
+            grades = [info.get('grade') or 'Unknown' for info in records]
+            if np is None:
+                return [self._parse(s) for s in stamps], grades
+            try:
+                parsed = np.array([s if self._valid(s) else 'NaT' for s in stamps],
+                                  dtype='datetime64[s]')
+            except ValueError:
+                # Well-formed but impossible dates such as 2024-02-30
+                parsed = np.array([self._parse(s) or 'NaT' for s in stamps], dtype='datetime64[s]')
+            # Grades become integer codes so they can be counted with bincount
+            names = {}
+            codes = np.fromiter((names.setdefault(g, len(names)) for g in grades),
+                                dtype=np.intp, count=len(grades))
+            return parsed, (codes, list(names))
+        return self._cached(('columns', field), compute)
+
+    def _buckets(self, period, field):
+        """Return the period key and grade of every record with a timestamp."""
+        def compute():
+            stamps, grades = self._columns(field)
+            if np is None:
+                labels, kept = [], []
+                for stamp, grade in zip(stamps, grades):
+                    if stamp is None:
+                        continue
+                    if period == 'week':
+                        stamp = stamp - timedelta(days=stamp.weekday())
+                    labels.append(stamp.strftime("%Y-%m" if period == 'month' else "%Y-%m-%d"))
+                    kept.append(grade)
+                return labels, kept
+            valid = ~np.isnat(stamps)
+            days = stamps[valid].astype('datetime64[D]')
+            if period == 'week':
+                # Day 0 (1970-01-01) was a Thursday; shift back to Monday
+                offset = days.astype(np.int64)
+                days = (offset - (offset + 3) % 7).astype('datetime64[D]')
+            elif period == 'month':
+                days = days.astype('datetime64[M]')
+            codes, names = grades
+            return days, (codes[valid], names)
+        return self._cached(('buckets', period, field), compute)
+
+    def enrollments(self, period='day', field='created'):
+        """Count records per period as a sorted list of (label, count)."""
+        self._check(period, field)
+
+        def compute():
+            keys, _ = self._buckets(period, field)
+            if np is None:
+                counts = {}
+                for key in keys:
+                    counts[key] = counts.get(key, 0) + 1
+                return sorted(counts.items())
+            labels, counts = np.unique(keys, return_counts=True)
+            return list(zip(np.datetime_as_string(labels).tolist(), counts.tolist()))
+        return self._cached(('enrollments', period, field), compute)
+
+    def grade_by_period(self, period='month', field='created'):
+        """Cross-tab of grades against periods.
+
+        Returns (grades, rows) where each row is (label, [count per grade]).
+        """
+        self._check(period, field)
+
+        def compute():
+            keys, grades = self._buckets(period, field)
+            if np is None:
+                names = sorted(set(grades))
+                column = {grade: i for i, grade in enumerate(names)}
+                table = {}
+                for key, grade in zip(keys, grades):
+                    row = table.setdefault(key, [0] * len(names))
+                    row[column[grade]] += 1
+                return names, sorted(table.items())
+            codes, names = grades
+            labels, p_idx = np.unique(keys, return_inverse=True)
+            table = np.bincount(p_idx * len(names) + codes,
+                                minlength=len(labels) * len(names))
+            table = table.reshape(len(labels), len(names))
+            # Drop grades with no dated records and put the rest in name order
+            order = [i for i in np.argsort(names) if table[:, i].any()]
+            table = table[:, order]
+            return ([names[i] for i in order],
+                    list(zip(np.datetime_as_string(labels).tolist(), table.tolist())))
+        return self._cached(('grade_by_period', period, field), compute)
+
+    @staticmethod
+    def _period_range(first, last, period):
+        """Every period label from ``first`` to ``last`` inclusive."""
+        if first is None:
+            return []
+        if np is not None:
+            unit, step = ('M', 1) if period == 'month' else ('D', 7 if period == 'week' else 1)
+            labels = np.arange(np.datetime64(first, unit), np.datetime64(last, unit) + step, step)
+            return np.datetime_as_string(labels).tolist()
+        if period == 'month':
+            year, month = map(int, first.split('-'))
+            labels = [first]
+            while labels[-1] != last:
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+                labels.append(f"{year:04d}-{month:02d}")
+            return labels
+        day = datetime.strptime(first, "%Y-%m-%d")
+        step = timedelta(days=7 if period == 'week' else 1)
+        labels = [first]
+        while labels[-1] != last:
+            day += step
+            labels.append(day.strftime("%Y-%m-%d"))
+        return labels
+
+    def growth(self, period='month', field='created'):
+        """Enrollment trend as (label, count, cumulative, change %) tuples.
+
+        Periods without enrollments are included with a count of 0. The change
+        is relative to the previous period and is None when there is nothing to
+        compare against (the first period, or one after a period with no enrollments).
+        """
+        self._check(period, field)
+
+        def compute():
+            counts = dict(self.enrollments(period, field))
+            trend = []
+            total = 0
+            previous = None
+            for label in self._period_range(min(counts, default=None), max(counts, default=None), period):
+                count = counts.get(label, 0)
+                total += count
+                change = None if not previous else round((count - previous) * 100.0 / previous, 1)
+                trend.append((label, count, total, change))
+                previous = count
+            return trend
+        return self._cached(('growth', period, field), compute)
+
+class BackupManager:
+    """Compressed full and incremental backups of the StudentManager data.
+
+    A backup file holds one ``[student_id, record]`` JSON line per student and
+    ``[student_id, null]`` for a deletion. Full backups hold every record,
+    incremental ones only what changed since the previous backup. The manifest
+    stores the SHA-256 of each file's uncompressed content for verification.
+    """
+    OPENERS = {'gzip': (functools.partial(gzip.open, compresslevel=6), '.gz'),
+               'lzma': (lzma.open, '.xz')}
+
+    def __init__(self, manager, directory="backups", compression='gzip', full_every=7):
+        if compression not in self.OPENERS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.manager = manager
+        self.directory = directory
+        self.compression = compression
+        self.full_every = full_every
+        self.manifest_file = os.path.join(directory, "manifest.json")
+        self._lock = threading.Lock()
+
+    def list_backups(self):
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'r') as f:
+                return json.load(f)
+        return []
+
+    def _write_atomic(self, path, write, opener=open, mode='w'):
+        tmp = path + '.tmp'
+        with opener(tmp, mode) as f:
+            write(f)
+        os.replace(tmp, path)
+
+    # The state holds an 8-byte digest of every record at the last backup,
+    # used to find what changed. It is stored compressed: one JSON line with
+    # the student IDs, then the digests packed in the same order.
+    
+    @staticmethod
+    def _digest(info):
+        # repr is much cheaper than JSON, so only changed records get encoded
+        return hashlib.blake2b(repr(info).encode(), digest_size=8).digest()
+    
+    def _state_file(self, compression):
+        return os.path.join(self.directory, "state.bin" + self.OPENERS[compression][1])
+    
+    def _load_state(self):
+        for compression, (opener, ext) in self.OPENERS.items():
+            path = self._state_file(compression)
+            if not os.path.exists(path):
+                continue
+            try:
+                with opener(path, 'rb') as f:
+                    ids = json.loads(f.readline())
+                    packed = f.read()
+            except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError):
+                return None
+            if len(packed) != 8 * len(ids):
+                return None
+            return {sid: packed[i * 8:i * 8 + 8] for i, sid in enumerate(ids)}
+        return None
+    
+    def _rebuild_state(self):
+        """Recompute the state from the latest backup chain, e.g. if it was deleted."""
+        try:
+            return {sid: self._digest(info) for sid, info in self.restore().items()}
+        except (OSError, EOFError, ValueError, TypeError, zlib.error, lzma.LZMAError):
+            return None
+    
+    def _save_state(self, digests):
+        opener, ext = self.OPENERS[self.compression]
+        
+        def write(f):
+            f.write((json.dumps(list(digests)) + "\n").encode())
+            f.write(b"".join(digests.values()))
+        
+        self._write_atomic(self._state_file(self.compression), write, opener, 'wb')
+        for compression in self.OPENERS:
+            if compression != self.compression and os.path.exists(self._state_file(compression)):
+                os.remove(self._state_file(compression))
+
+    def backup(self, full=None):
+        """Write a backup and return its manifest entry.
+
+        With ``full=None`` an incremental backup is written unless there is no
+        previous state or ``full_every`` backups have passed since the last full one.
+        """
+        with self._lock:
+            backups = self.list_backups()
+            state = None
+            if backups:
+                state = self._load_state() or self._rebuild_state()
+            if full is None:
+                since_full = 0
+                for entry in reversed(backups):
+                    if entry['type'] == 'full':
+                        break
+                    since_full += 1
+                full = state is None or since_full + 1 >= self.full_every
+            elif not full and state is None:
+                raise ValueError("An incremental backup needs a previous backup")
+            
+            # update_student replaces records instead of editing them, so this
+            # copy stays consistent while the GUI keeps working. It covers the
+            # whole roster even when a sharded manager has a narrowed view.
+            records = self.manager.all_records()
+            
+            entry_id = backups[-1]['id'] + 1 if backups else 1
+            kind = 'full' if full else 'incremental'
+            opener, ext = self.OPENERS[self.compression]
+            filename = f"{entry_id:06d}-{kind}.jsonl{ext}"
+            os.makedirs(self.directory, exist_ok=True)
+            
+            digests = {}
+            checksum = hashlib.sha256()
+            counts = {'records': 0, 'deleted': 0}
+            
+            def write(f):
+                batch = []
+                for sid, info in records:
+                    digest = self._digest(info)
+                    digests[sid] = digest
+                    if full or state.get(sid) != digest:
+                        batch.append((json.dumps([sid, info]) + "\n").encode())
+                        counts['records'] += 1
+                    if len(batch) >= 1000:
+                        self._write_batch(f, batch, checksum)
+                if not full:
+                    for sid in sorted(state.keys() - digests.keys()):
+                        batch.append((json.dumps([sid, None]) + "\n").encode())
+                        counts['deleted'] += 1
+                self._write_batch(f, batch, checksum)
+            
+            path = os.path.join(self.directory, filename)
+            self._write_atomic(path, write, opener, 'wb')
+            
+            entry = {
+                "id": entry_id,
+                "type": kind,
+                "file": filename,
+                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "records": counts['records'],
+                "deleted": counts['deleted'],
+                "size": os.path.getsize(path),
+                "sha256": checksum.hexdigest()
+            }
+            backups.append(entry)
+            # Manifest first: if we stop before the state is saved, the next
+            # incremental backup only repeats some records
+            self._write_atomic(self.manifest_file, lambda f: json.dump(backups, f, indent=2))
+            self._save_state(digests)
+            return entry
+
+    @staticmethod
+    def _write_batch(f, batch, checksum):
+        data = b"".join(batch)
+        checksum.update(data)
+        f.write(data)
+        batch.clear()
+
+    def _read(self, entry):
+        """Yield (student_id, record) pairs, checking the checksum at the end."""
+        opener = gzip.open if entry['file'].endswith('.gz') else lzma.open
+        checksum = hashlib.sha256()
+        with opener(os.path.join(self.directory, entry['file']), 'rb') as f:
+            for line in f:
+                checksum.update(line)
+                sid, info = json.loads(line)
+                yield sid, info
+        if checksum.hexdigest() != entry['sha256']:
+            raise ValueError(f"Backup {entry['id']} failed checksum verification")
+
+    def verify(self, backup_id=None):
+        """Check backups against their checksums. Returns {backup id: ok}."""
+        results = {}
+        for entry in self.list_backups():
+            if backup_id is not None and entry['id'] != backup_id:
+                continue
+            try:
+                for _ in self._read(entry):
+                    pass
+                results[entry['id']] = True
+            except (OSError, EOFError, ValueError, TypeError, zlib.error, lzma.LZMAError):
+                results[entry['id']] = False
+        return results
+
+    def restore(self, backup_id=None, at=None):
+        """Rebuild the student data as of a backup.
+
+        Pass a backup id, or ``at`` ("YYYY-MM-DD HH:MM:SS") to use the last
+        backup taken at or before that time. Defaults to the latest backup.
+        The data is returned, not saved.
+        """
+        backups = self.list_backups()
+        if at is not None:
+            chain = [entry for entry in backups if entry['created'] <= at]
+        elif backup_id is not None:
+            chain = [entry for entry in backups if entry['id'] <= backup_id]
+            if chain and chain[-1]['id'] != backup_id:
+                chain = []
+        else:
+            chain = backups
+        fulls = [i for i, entry in enumerate(chain) if entry['type'] == 'full']
+        if not fulls:
+            raise ValueError("No backup found to restore from")
+        
+        students = {}
+        for entry in chain[fulls[-1]:]:
+            for sid, info in self._read(entry):
+                if info is None:
+                    students.pop(sid, None)
+                else:
+                    students[sid] = info
+        return students
+
 class StudentGUI:
     def __init__(self):
-        self.manager = StudentManager()
+        # Use the sharded roster once one has been created with ShardedStudentManager.split
+        if os.path.exists(os.path.join("roster", "manifest.json")):
+            self.manager = ShardedStudentManager(view=ShardedStudentManager.saved_view())
+        else:
+            self.manager = StudentManager()
+        self.analytics = StudentAnalytics(self.manager)
+        self.backups = BackupManager(self.manager)
+        self.search_results = queue.Queue()
+        self.search_request = 0
+        self.search_after = None
+        self.search_poll = None
         self.root = tk.Tk()
         self.root.title("🎓 Student Management System - Advanced Edition")
         self.root.geometry("1400x800")
@@ -345,6 +1247,10 @@ class StudentGUI:
                                  self.colors['danger'], 0, 2)
         self.create_modern_button(btn_container, "🔄 Refresh", self.refresh_list,
                                  self.colors['primary'], 0, 3)
+        self.create_modern_button(btn_container, "📈 Reports", self.show_reports,
+                                 self.colors['info'], 0, 4)
+        self.create_modern_button(btn_container, "💾 Backups", self.show_backups,
+                                 self.colors['accent'], 0, 5)
         
         # Table container with modern design
         table_shadow = tk.Frame(content_frame, bg='#e2e8f0', height=3)
@@ -359,6 +1265,15 @@ class StudentGUI:
         tk.Label(table_header, text="📊 Student Records", bg='#ffffff',
                 fg=self.colors['text'], font=('Segoe UI', 14, 'bold')).pack(side='left')
         
+        if isinstance(self.manager, ShardedStudentManager):
+            self.shard_var = tk.StringVar(value=self.manager.view[0] if self.manager.view else "All shards")
+            self.shard_combo = ttk.Combobox(table_header, textvariable=self.shard_var,
+                                            state='readonly', width=16)
+            self.shard_combo.pack(side='right')
+            self.shard_combo.bind('<<ComboboxSelected>>', self.on_shard_change)
+            tk.Label(table_header, text="Shard", bg='#ffffff', fg=self.colors['text_light'],
+                    font=('Segoe UI', 10, 'bold')).pack(side='right', padx=(0, 8))
+        
         tree_frame = tk.Frame(table_container, bg='#ffffff')
         tree_frame.pack(fill='both', expand=True, padx=20, pady=(0, 15))
         
@@ -420,7 +1335,10 @@ class StudentGUI:
             tree.selection_set(item)
     
     def refresh_list(self):
-        self.manager.students = self.manager.load_data()
+        self.stop_search()
+        self.manager.reload()
+        if isinstance(self.manager, ShardedStudentManager):
+            self.shard_combo['values'] = ["All shards"] + self.manager.shard_keys()
         
         for item in self.tree.get_children():
             self.tree.delete(item)
@@ -468,16 +1386,72 @@ class StudentGUI:
                                     label.config(text=value)
                                     return
     
+    def on_shard_change(self, event=None):
+        shard = self.shard_var.get()
+        self.manager.set_view(None if shard == "All shards" else [shard], remember=True)
+        self.search_var.set('')
+        self.refresh_list()
+    
     def on_search(self, event=None):
         query = self.search_var.get()
         if not query:
             self.refresh_list()
             return
         
+        if isinstance(self.manager, ShardedStudentManager):
+            # Sharded searches can be slow, so wait for a pause in typing
+            self.stop_search()
+            self.search_after = self.root.after(300, lambda: self.start_search(query))
+            return
+        
+        self.show_search_results(self.manager.search_students(query))
+    
+    def stop_search(self):
+        # Forget any pending or running search and stop polling for its result
+        self.search_request += 1
+        if self.search_after:
+            self.root.after_cancel(self.search_after)
+            self.search_after = None
+        if self.search_poll:
+            self.root.after_cancel(self.search_poll)
+            self.search_poll = None
+    
+    def start_search(self, query):
+        # Sharded searches may fan out to worker processes, so run them off the Tk thread
+        self.search_after = None
+        request = self.search_request
+        
+        def worker():
+            try:
+                self.search_results.put((request, self.manager.search_students(query)))
+            except Exception as e:
+                self.search_results.put((request, e))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.status_var.set("⏳ Searching...")
+        if not self.search_poll:
+            self.search_poll = self.root.after(50, self.poll_search)
+    
+    def poll_search(self):
+        try:
+            request, results = self.search_results.get_nowait()
+        except queue.Empty:
+            self.search_poll = self.root.after(50, self.poll_search)
+            return
+        if request != self.search_request:
+            # Left over from a search that was replaced or stopped
+            self.search_poll = self.root.after(50, self.poll_search)
+            return
+        self.search_poll = None
+        if isinstance(results, Exception):
+            self.status_var.set(f"❌ Search failed: {results}")
+            return
+        self.show_search_results(results)
+    
+    def show_search_results(self, results):
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        results = self.manager.search_students(query)
         for sid, info in results:
             self.tree.insert('', 'end', values=(
                 sid, info['name'], info['grade'], 
@@ -493,17 +1467,16 @@ class StudentGUI:
         self.root.wait_window(dialog.dialog)
         if dialog.result:
             data = dialog.result
-            if data['id'] in self.manager.students:
+            if data['id'] in self.manager.students or not self.manager.add_student(
+                    student_id=data['id'],
+                    name=data['name'],
+                    grade=data['grade'],
+                    email=data['email'],
+                    phone=data['phone'],
+                    campus=data['campus']):
                 messagebox.showerror("Error", "Student ID already exists!")
                 return
             
-            self.manager.add_student(
-                student_id=data['id'],
-                name=data['name'],
-                grade=data['grade'],
-                email=data['email'],
-                phone=data['phone']
-            )
             self.refresh_list()
             messagebox.showinfo("✅ Success", "Student added successfully!")
     
@@ -516,7 +1489,7 @@ class StudentGUI:
         item = self.tree.item(selected[0])
         student_id = str(item['values'][0])
         
-        self.manager.students = self.manager.load_data()
+        self.manager.reload()
         
         if student_id not in self.manager.students:
             messagebox.showerror("Error", "Student not found!")
@@ -595,12 +1568,20 @@ class StudentGUI:
             messagebox.showinfo("📅 Students Added Today", 
                                "No students were added today.")
     
+    def show_reports(self):
+        ReportsWindow(self.root, self.analytics)
+    
+    def show_backups(self):
+        BackupWindow(self.root, self.backups, self.refresh_list)
+    
     def clear_search_filter(self):
         self.search_var.set('')
         self.refresh_list()
     
     def run(self):
         self.root.mainloop()
+        if isinstance(self.manager, ShardedStudentManager):
+            self.manager.close()
 
 class StudentDialog:
     def __init__(self, parent, title, data=None, student_id=None):
@@ -608,7 +1589,7 @@ class StudentDialog:
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(title)
-        self.dialog.geometry("600x580")
+        self.dialog.geometry("600x660")
         self.dialog.configure(bg='#f0f4f8')
         self.dialog.transient(parent)
         self.dialog.grab_set()
@@ -616,7 +1597,7 @@ class StudentDialog:
         
         self.dialog.update_idletasks()
         x = (self.dialog.winfo_screenwidth() // 2) - 300
-        y = (self.dialog.winfo_screenheight() // 2) - 290
+        y = (self.dialog.winfo_screenheight() // 2) - 330
         self.dialog.geometry(f"+{x}+{y}")
         
         # Header
@@ -645,7 +1626,8 @@ class StudentDialog:
             ("👤 Full Name", 'name_var', data.get('name', '') if data else '', False, "Enter student's full name"),
             ("🎓 Grade", 'grade_var', data.get('grade', '') if data else '', False, "Enter grade (e.g., 10th, 12th)"),
             ("📧 Email Address", 'email_var', data.get('email', '') if data else '', False, "Enter email address"),
-            ("📱 Phone Number", 'phone_var', data.get('phone', '') if data else '', False, "Enter phone number with country code")
+            ("📱 Phone Number", 'phone_var', data.get('phone', '') if data else '', False, "Enter phone number with country code"),
+            ("🏫 Campus", 'campus_var', data.get('campus', '') if data else '', False, "Enter campus (optional)")
         ]
         
         for i, (label_text, var_name, value, readonly, placeholder) in enumerate(fields):
@@ -709,10 +1691,356 @@ class StudentDialog:
             'name': self.name_var.get().strip(),
             'grade': self.grade_var.get().strip(),
             'email': self.email_var.get().strip(),
-            'phone': self.phone_var.get().strip()
+            'phone': self.phone_var.get().strip(),
+            'campus': self.campus_var.get().strip()
         }
         self.dialog.destroy()
 
+class ReportsWindow:
+    def __init__(self, parent, analytics):
+        self.analytics = analytics
+        self.results = queue.Queue()
+        self.request = 0
+        self.polling = False
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Enrollment Reports")
+        self.window.geometry("900x620")
+        self.window.configure(bg='#f0f4f8')
+        self.window.transient(parent)
+        
+        # Header
+        header = tk.Frame(self.window, bg='#1e3a8a', height=80)
+        header.pack(fill='x')
+        header.pack_propagate(False)
+        
+        tk.Label(header, text="📈 Enrollment Reports",
+                bg='#1e3a8a', fg='#ffffff',
+                font=('Segoe UI', 20, 'bold')).pack(expand=True)
+        
+        content = tk.Frame(self.window, bg='#f0f4f8')
+        content.pack(fill='both', expand=True, padx=30, pady=20)
+        
+        # Report options
+        options = tk.Frame(content, bg='#ffffff', highlightthickness=1, highlightbackground='#cbd5e1')
+        options.pack(fill='x', pady=(0, 15))
+        
+        options_content = tk.Frame(options, bg='#ffffff')
+        options_content.pack(fill='x', padx=20, pady=12)
+        
+        self.period_var = tk.StringVar(value='month')
+        self.field_var = tk.StringVar(value='created')
+        for label_text, var, values in [("Group by", self.period_var, StudentAnalytics.PERIODS),
+                                        ("Date field", self.field_var, StudentAnalytics.FIELDS)]:
+            tk.Label(options_content, text=label_text, bg='#ffffff', fg='#1e293b',
+                    font=('Segoe UI', 10, 'bold')).pack(side='left', padx=(0, 8))
+            combo = ttk.Combobox(options_content, textvariable=var, values=values,
+                                 state='readonly', width=10)
+            combo.pack(side='left', padx=(0, 25))
+            combo.bind('<<ComboboxSelected>>', lambda e: self.load_reports())
+        
+        self.status_var = tk.StringVar()
+        tk.Label(options_content, textvariable=self.status_var, bg='#ffffff',
+                fg='#64748b', font=('Segoe UI', 9)).pack(side='right')
+        
+        # Report tables
+        notebook = ttk.Notebook(content)
+        notebook.pack(fill='both', expand=True)
+        
+        self.trend_tree = self.create_table(notebook, "📈 Growth Trend",
+                                            ('Period', 'New', 'Total', 'Change'))
+        self.grade_tree = self.create_table(notebook, "📚 Grades by Period", ('Period',))
+        
+        self.window.bind('<Escape>', lambda e: self.window.destroy())
+        self.load_reports()
+    
+    def create_table(self, notebook, title, columns):
+        frame = tk.Frame(notebook, bg='#ffffff')
+        notebook.add(frame, text=title)
+        
+        tree = ttk.Treeview(frame, columns=columns, show='headings', style='Modern.Treeview')
+        vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        hsb = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
+        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        
+        tree.grid(row=0, column=0, sticky='nsew')
+        vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        
+        tree.tag_configure('oddrow', background='#ffffff')
+        tree.tag_configure('evenrow', background='#f9fafb')
+        self.set_columns(tree, columns)
+        return tree
+    
+    def set_columns(self, tree, columns):
+        tree.configure(columns=columns)
+        for col in columns:
+            tree.heading(col, text=col.upper())
+            tree.column(col, width=140, anchor='center')
+    
+    def load_reports(self):
+        # Reports are computed on a worker thread so large rosters never freeze the window
+        self.request += 1
+        self.status_var.set("⏳ Computing reports...")
+        worker = threading.Thread(target=self.compute_reports,
+                                  args=(self.request, self.period_var.get(), self.field_var.get()),
+                                  daemon=True)
+        worker.start()
+        if not self.polling:
+            self.polling = True
+            self.window.after(50, self.poll_results)
+    
+    def compute_reports(self, request, period, field):
+        start = time.perf_counter()
+        try:
+            trend = self.analytics.growth(period, field)
+            grades, table = self.analytics.grade_by_period(period, field)
+        except Exception as e:
+            self.results.put((request, e))
+            return
+        self.results.put((request, (trend, grades, table, time.perf_counter() - start)))
+    
+    def poll_results(self):
+        if not self.window.winfo_exists():
+            return
+        try:
+            request, result = self.results.get_nowait()
+        except queue.Empty:
+            self.window.after(50, self.poll_results)
+            return
+        if request != self.request:
+            # A newer report was requested while this one was running
+            self.window.after(50, self.poll_results)
+            return
+        self.polling = False
+        if isinstance(result, Exception):
+            self.status_var.set(f"❌ Could not compute reports: {result}")
+            return
+        
+        trend, grades, table, elapsed = result
+        trend_rows = [(label, count, total, '—' if change is None else f"{change:+.1f}%")
+                      for label, count, total, change in trend]
+        grade_rows = [(label, *counts, sum(counts)) for label, counts in table]
+        self.set_columns(self.grade_tree, ('Period', *grades, 'Total'))
+        self.fill_table(self.trend_tree, trend_rows, request)
+        self.fill_table(self.grade_tree, grade_rows, request)
+        self.status_var.set(f"✅ {len(trend_rows)} period(s) in {elapsed:.2f}s")
+    
+    def fill_table(self, tree, rows, request, start=0, chunk=500):
+        # Insert rows in chunks so the window keeps redrawing between batches
+        if request != self.request or not self.window.winfo_exists():
+            return
+        if start == 0:
+            tree.delete(*tree.get_children())
+        for i, row in enumerate(rows[start:start + chunk], start):
+            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
+            tree.insert('', 'end', values=row, tags=(tag,))
+        if start + chunk < len(rows):
+            self.window.after(1, lambda: self.fill_table(tree, rows, request, start + chunk, chunk))
+
+class BackupWindow:
+    def __init__(self, parent, backups, on_restore):
+        self.parent = parent
+        self.backups = backups
+        self.on_restore = on_restore
+        self.results = queue.Queue()
+        self.busy = False
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Backups")
+        self.window.geometry("900x620")
+        self.window.configure(bg='#f0f4f8')
+        self.window.transient(parent)
+        
+        # Header
+        header = tk.Frame(self.window, bg='#1e3a8a', height=80)
+        header.pack(fill='x')
+        header.pack_propagate(False)
+        
+        tk.Label(header, text="💾 Backups",
+                bg='#1e3a8a', fg='#ffffff',
+                font=('Segoe UI', 20, 'bold')).pack(expand=True)
+        
+        content = tk.Frame(self.window, bg='#f0f4f8')
+        content.pack(fill='both', expand=True, padx=30, pady=20)
+        
+        # Backup options and actions
+        options = tk.Frame(content, bg='#ffffff', highlightthickness=1, highlightbackground='#cbd5e1')
+        options.pack(fill='x', pady=(0, 15))
+        
+        options_content = tk.Frame(options, bg='#ffffff')
+        options_content.pack(fill='x', padx=20, pady=12)
+        
+        tk.Label(options_content, text="Compression", bg='#ffffff', fg='#1e293b',
+                font=('Segoe UI', 10, 'bold')).grid(row=0, column=0, sticky='w', padx=(0, 8))
+        self.compression_var = tk.StringVar(value=backups.compression)
+        ttk.Combobox(options_content, textvariable=self.compression_var,
+                     values=tuple(BackupManager.OPENERS), state='readonly',
+                     width=8).grid(row=0, column=1, sticky='w', padx=(0, 25))
+        
+        tk.Label(options_content, text="Restore as of", bg='#ffffff', fg='#1e293b',
+                font=('Segoe UI', 10, 'bold')).grid(row=0, column=2, sticky='w', padx=(0, 8))
+        self.at_var = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        tk.Entry(options_content, textvariable=self.at_var, bg='#f8fafc', fg='#1e293b',
+                font=('Segoe UI', 10), relief='flat', highlightthickness=1,
+                highlightbackground='#cbd5e1', width=20).grid(row=0, column=3, sticky='w', ipady=4)
+        
+        btn_container = tk.Frame(options_content, bg='#ffffff')
+        btn_container.grid(row=1, column=0, columnspan=4, sticky='w', pady=(12, 0))
+        
+        for col, (text, command, color) in enumerate([
+                ("📦 Full Backup", lambda: self.backup(True), '#2563eb'),
+                ("➕ Incremental", lambda: self.backup(False), '#10b981'),
+                ("✔️ Verify", self.verify, '#8b5cf6'),
+                ("⏪ Restore", self.restore, '#ef4444')]):
+            tk.Button(btn_container, text=text, command=command,
+                     bg=color, fg='white', font=('Segoe UI', 10, 'bold'),
+                     relief='flat', cursor='hand2', padx=14, pady=8,
+                     activebackground=color, activeforeground='white',
+                     bd=0).grid(row=0, column=col, padx=(0, 8))
+        
+        self.status_var = tk.StringVar(value="Select a backup to restore it, or restore as of a time.")
+        tk.Label(content, textvariable=self.status_var, bg='#f0f4f8',
+                fg='#64748b', font=('Segoe UI', 9)).pack(anchor='w', pady=(0, 8))
+        
+        # Backup history
+        tree_frame = tk.Frame(content, bg='#ffffff')
+        tree_frame.pack(fill='both', expand=True)
+        
+        columns = ('ID', 'Type', 'Created', 'Records', 'Deleted', 'Size')
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings',
+                                 style='Modern.Treeview', selectmode='browse')
+        for col in columns:
+            self.tree.heading(col, text=col.upper())
+            self.tree.column(col, width=120, anchor='center')
+        self.tree.column('Created', width=180)
+        
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vsb.set)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        vsb.grid(row=0, column=1, sticky='ns')
+        tree_frame.columnconfigure(0, weight=1)
+        tree_frame.rowconfigure(0, weight=1)
+        
+        self.tree.tag_configure('oddrow', background='#ffffff')
+        self.tree.tag_configure('evenrow', background='#f9fafb')
+        
+        self.window.bind('<Escape>', lambda e: self.window.destroy())
+        self.refresh_history()
+    
+    def refresh_history(self, marks=None):
+        self.tree.delete(*self.tree.get_children())
+        for i, entry in enumerate(reversed(self.backups.list_backups())):
+            tag = 'evenrow' if i % 2 == 0 else 'oddrow'
+            backup_id = entry['id']
+            if marks and backup_id in marks:
+                backup_id = f"{backup_id} {'✅' if marks[backup_id] else '❌'}"
+            self.tree.insert('', 'end', iid=str(entry['id']), values=(
+                backup_id, entry['type'], entry['created'], entry['records'],
+                entry['deleted'], f"{entry['size'] / 1024:.1f} KB"
+            ), tags=(tag,))
+    
+    def run_task(self, message, task, done, apply=None):
+        # Only task runs on the worker thread. apply runs on the Tk thread even if
+        # this window was closed meanwhile, and done only while it is still open.
+        if self.busy:
+            messagebox.showwarning("⚠️ Warning", "Please wait for the current task to finish.",
+                                   parent=self.window)
+            return
+        self.busy = True
+        self.status_var.set(message)
+        
+        def worker():
+            start = time.perf_counter()
+            try:
+                self.results.put((done, apply, task(), time.perf_counter() - start))
+            except Exception as e:
+                self.results.put((done, apply, e, time.perf_counter() - start))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        # Poll from the parent so results are still applied after this window closes
+        self.parent.after(100, self.poll_results)
+    
+    def poll_results(self):
+        try:
+            done, apply, result, elapsed = self.results.get_nowait()
+        except queue.Empty:
+            self.parent.after(100, self.poll_results)
+            return
+        self.busy = False
+        is_open = self.window.winfo_exists()
+        if isinstance(result, Exception):
+            if is_open:
+                self.status_var.set("❌ Task failed")
+            messagebox.showerror("❌ Error", str(result),
+                                 parent=self.window if is_open else self.parent)
+            return
+        if apply:
+            result = apply(result)
+        if is_open:
+            done(result, elapsed)
+    
+    def backup(self, full):
+        self.backups.compression = self.compression_var.get()
+        
+        def done(entry, elapsed):
+            self.refresh_history()
+            self.status_var.set(f"✅ {entry['type'].title()} backup {entry['id']} saved "
+                                f"{entry['records']} record(s) in {elapsed:.2f}s")
+        
+        self.run_task("⏳ Writing backup...", lambda: self.backups.backup(full), done)
+    
+    def verify(self):
+        def done(results, elapsed):
+            failed = [backup_id for backup_id, ok in results.items() if not ok]
+            self.refresh_history(results)
+            if failed:
+                self.status_var.set(f"❌ {len(failed)} backup(s) failed verification")
+            else:
+                self.status_var.set(f"✅ {len(results)} backup(s) verified in {elapsed:.2f}s")
+        
+        self.run_task("⏳ Verifying backups...", self.backups.verify, done)
+    
+    def restore(self):
+        selected = self.tree.selection()
+        if selected:
+            backup_id, at = int(selected[0]), None
+            target = f"backup {backup_id}"
+        else:
+            backup_id, at = None, self.at_var.get().strip()
+            try:
+                datetime.strptime(at, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                messagebox.showerror("❌ Error", "Enter the time as YYYY-MM-DD HH:MM:SS.",
+                                     parent=self.window)
+                return
+            target = at
+        
+        if not messagebox.askyesno("⏪ Confirm Restore",
+                                   f"Replace all current student records with {target}?\n\n"
+                                   "Take a backup first if you may need the current data.",
+                                   parent=self.window):
+            return
+        
+        manager = self.backups.manager
+        
+        def task():
+            # Reading the backup and writing the new data files both happen here
+            return manager.prepare_replace(self.backups.restore(backup_id, at))
+        
+        def apply(pending):
+            # Only the file swap and the in-memory switch run on the Tk thread
+            count = manager.commit_replace(pending)
+            self.on_restore()
+            return count
+        
+        def done(count, elapsed):
+            self.status_var.set(f"✅ Restored {count} record(s) from {target} in {elapsed:.2f}s")
+        
+        self.run_task("⏳ Restoring...", task, done, apply)
+
 if __name__ == "__main__":
     app = StudentGUI()
     app.run()
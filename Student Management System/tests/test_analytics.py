@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import index
+
+
+STUDENTS = {
+    # Sunday and Monday of the same calendar month fall in different weeks
+    "S1": {"name": "A", "grade": "10th", "created": "2024-03-03 23:59:59"},
+    "S2": {"name": "B", "grade": "10th", "created": "2024-03-04 00:00:00"},
+    "S3": {"name": "C", "grade": "11th", "created": "2024-03-10 12:00:00",
+           "modified": "2024-06-01 08:00:00"},
+    # A week that crosses a month and a year boundary
+    "S4": {"name": "D", "grade": "", "created": "2024-12-31 09:00:00"},
+    "S5": {"name": "E", "grade": "12th", "created": "2025-01-01 09:00:00"},
+    # No enrollments in the months between, so growth() has to fill them in
+    "S6": {"name": "F", "grade": "12th", "created": "2025-04-15 10:00:00"},
+    # Not counted by either path
+    "S7": {"name": "G", "grade": "9th", "created": "2024-03-05"},
+    "S8": {"name": "H", "grade": "9th", "created": "2024-02-30 10:00:00"},
+    "S9": {"name": "I", "grade": "9th"},
+}
+
+
+class StudentAnalyticsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "students.json")
+        with open(path, 'w') as f:
+            json.dump(STUDENTS, f)
+        self.manager = index.StudentManager(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reports(self):
+        analytics = index.StudentAnalytics(self.manager)
+        results = {}
+        for period in analytics.PERIODS:
+            for field in analytics.FIELDS:
+                results[period, field] = (analytics.enrollments(period, field),
+                                          analytics.grade_by_period(period, field),
+                                          analytics.growth(period, field))
+        return results
+
+    def python_reports(self):
+        with mock.patch.object(index, 'np', None):
+            return self.reports()
+
+    def test_week_starts_on_monday(self):
+        analytics = index.StudentAnalytics(self.manager)
+        with mock.patch.object(index, 'np', None):
+            self.assertEqual(analytics.enrollments('week'),
+                             [("2024-02-26", 1), ("2024-03-04", 2),
+                              ("2024-12-30", 2), ("2025-04-14", 1)])
+
+    def test_growth_fills_gaps(self):
+        with mock.patch.object(index, 'np', None):
+            growth = index.StudentAnalytics(self.manager).growth('month')
+        labels = [row[0] for row in growth]
+        self.assertEqual(labels[0], "2024-03")
+        self.assertEqual(labels[-1], "2025-04")
+        self.assertEqual(len(labels), 14)
+        self.assertEqual(growth[0], ("2024-03", 3, 3, None))
+        self.assertEqual(growth[1], ("2024-04", 0, 3, -100.0))
+        # Nothing to compare against after an empty month
+        self.assertEqual(growth[-1], ("2025-04", 1, 6, None))
+        self.assertEqual(growth[-1][2], 6)
+
+    def test_grade_by_period(self):
+        with mock.patch.object(index, 'np', None):
+            grades, rows = index.StudentAnalytics(self.manager).grade_by_period('month')
+        self.assertEqual(grades, ["10th", "11th", "12th", "Unknown"])
+        self.assertEqual(rows[0], ("2024-03", [2, 1, 0, 0]))
+
+    @unittest.skipUnless(index.np is not None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        self.assertEqual(self.reports(), self.python_reports())
+
+    @unittest.skipUnless(index.np is not None, "NumPy is not installed")
+    def test_numpy_matches_python_for_weekly_growth(self):
+        analytics = index.StudentAnalytics(self.manager)
+        with mock.patch.object(index, 'np', None):
+            expected = index.StudentAnalytics(self.manager).growth('week')
+        self.assertEqual(analytics.growth('week'), expected)
+        self.assertEqual((expected[0][0], expected[-1][0], len(expected)),
+                         ("2024-02-26", "2025-04-14", 60))
+
+    def test_cache_follows_version(self):
+        analytics = index.StudentAnalytics(self.manager)
+        before = analytics.enrollments('month')
+        self.assertIs(analytics.enrollments('month'), before)
+        self.assertFalse(self.manager.reload())
+        self.assertIs(analytics.enrollments('month'), before)
+        self.manager.add_student("S10", "J", "10th")
+        self.assertEqual(sum(count for _, count in analytics.enrollments('month')),
+                         sum(count for _, count in before) + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import gzip
+import json
+import lzma
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import index
+
+
+class Clock(datetime):
+    """datetime whose now() returns a time set by the test."""
+    current = datetime(2025, 1, 1, 9, 0, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def roster(n):
+    return {f"S{i:03d}": {"name": f"Student {i}", "grade": "10th",
+                          "created": "2024-09-01 08:00:00"} for i in range(n)}
+
+
+class BackupManagerTest(unittest.TestCase):
+    compression = 'gzip'
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "students.json")
+        with open(path, 'w') as f:
+            json.dump(roster(20), f)
+        self.manager = index.StudentManager(path)
+        self.backups = index.BackupManager(self.manager, os.path.join(self.tmp.name, "backups"),
+                                           compression=self.compression)
+        patcher = mock.patch.object(index, 'datetime', Clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def backup_at(self, when, **kwargs):
+        Clock.current = datetime.strptime(when, "%Y-%m-%d %H:%M:%S")
+        return self.backups.backup(**kwargs)
+
+    def make_chain(self):
+        """A full backup and two incrementals, returning the data after each."""
+        snapshots = []
+        full = self.backup_at("2025-01-01 09:00:00")
+        snapshots.append(dict(self.manager.students))
+
+        self.manager.update_student("S001", name="Renamed")
+        self.manager.delete_student("S002")
+        self.manager.add_student("S100", "New", "11th")
+        first = self.backup_at("2025-01-02 09:00:00")
+        snapshots.append(dict(self.manager.students))
+
+        self.manager.delete_student("S100")
+        self.manager.delete_student("S003")
+        second = self.backup_at("2025-01-03 09:00:00")
+        snapshots.append(dict(self.manager.students))
+        return [full, first, second], snapshots
+
+    def test_chain_types_and_counts(self):
+        entries, _ = self.make_chain()
+        self.assertEqual([entry['type'] for entry in entries], ['full', 'incremental', 'incremental'])
+        self.assertEqual((entries[0]['records'], entries[0]['deleted']), (20, 0))
+        self.assertEqual((entries[1]['records'], entries[1]['deleted']), (2, 1))
+        self.assertEqual((entries[2]['records'], entries[2]['deleted']), (0, 2))
+
+    def test_restore_by_id(self):
+        entries, snapshots = self.make_chain()
+        for entry, snapshot in zip(entries, snapshots):
+            self.assertEqual(self.backups.restore(entry['id']), snapshot)
+        self.assertEqual(self.backups.restore(), snapshots[-1])
+
+    def test_restore_at_time(self):
+        _, snapshots = self.make_chain()
+        self.assertEqual(self.backups.restore(at="2025-01-01 09:00:00"), snapshots[0])
+        self.assertEqual(self.backups.restore(at="2025-01-02 23:59:59"), snapshots[1])
+        self.assertEqual(self.backups.restore(at="2030-01-01 00:00:00"), snapshots[2])
+        with self.assertRaises(ValueError):
+            self.backups.restore(at="2024-12-31 23:59:59")
+
+    def test_restore_unknown_id(self):
+        self.make_chain()
+        with self.assertRaises(ValueError):
+            self.backups.restore(99)
+
+    def test_full_every(self):
+        self.backups.full_every = 2
+        self.backup_at("2025-01-01 09:00:00")
+        self.assertEqual(self.backup_at("2025-01-02 09:00:00")['type'], 'incremental')
+        self.assertEqual(self.backup_at("2025-01-03 09:00:00")['type'], 'full')
+
+    def test_missing_state_is_rebuilt(self):
+        self.backup_at("2025-01-01 09:00:00")
+        os.remove(self.backups._state_file(self.compression))
+        self.manager.update_student("S004", grade="11th")
+        entry = self.backup_at("2025-01-02 09:00:00")
+        self.assertEqual((entry['type'], entry['records'], entry['deleted']), ('incremental', 1, 0))
+        self.assertEqual(self.backups.restore(), self.manager.students)
+
+    def test_verify_flags_corrupted_file(self):
+        entries, _ = self.make_chain()
+        self.assertEqual(self.backups.verify(), {1: True, 2: True, 3: True})
+
+        opener = gzip if self.compression == 'gzip' else lzma
+        path = os.path.join(self.backups.directory, entries[1]['file'])
+        with open(path, 'rb') as f:
+            data = opener.decompress(f.read())
+        with open(path, 'wb') as f:
+            f.write(opener.compress(data.replace(b"Renamed", b"Changed")))
+
+        self.assertEqual(self.backups.verify(), {1: True, 2: False, 3: True})
+        self.assertEqual(self.backups.verify(2), {2: False})
+        with self.assertRaises(ValueError):
+            self.backups.restore()
+
+    def test_verify_flags_truncated_file(self):
+        entries, _ = self.make_chain()
+        path = os.path.join(self.backups.directory, entries[0]['file'])
+        with open(path, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        self.assertEqual(self.backups.verify(1), {1: False})
+
+
+class LzmaBackupManagerTest(BackupManagerTest):
+    compression = 'lzma'
+
+
+if __name__ == '__main__':
+    unittest.main()
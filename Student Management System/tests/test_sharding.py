@@ -0,0 +1,178 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import index
+
+
+def roster():
+    grades = ["10th", "11th", "12th"]
+    return {f"S{i:03d}": {"name": f"Student {i}", "grade": grades[i % 3],
+                          "created": "2024-09-01 08:00:00"} for i in range(30)}
+
+
+class ShardedStudentManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "roster")
+        index.ShardedStudentManager.split(roster(), self.directory).close()
+        self.manager = index.ShardedStudentManager(self.directory, view=["10th"])
+
+    def tearDown(self):
+        self.manager.close()
+        self.tmp.cleanup()
+
+    def on_disk(self):
+        """Every shard file as {key: {student_id: record}}, read from scratch."""
+        other = index.ShardedStudentManager(self.directory)
+        try:
+            return {key: other._read_shard(key) for key in other.shard_keys()}
+        finally:
+            other.close()
+
+    @staticmethod
+    def partition(students):
+        shards = {}
+        for sid, info in students.items():
+            shards.setdefault(info['grade'], {})[sid] = info
+        return shards
+
+    def test_split(self):
+        shards = self.on_disk()
+        self.assertEqual(sorted(shards), ["10th", "11th", "12th"])
+        self.assertEqual([len(records) for records in shards.values()], [10, 10, 10])
+        self.assertEqual(sorted(self.manager.students), sorted(shards["10th"]))
+
+    def test_add_outside_view(self):
+        self.assertTrue(self.manager.add_student("S100", "New", "12th"))
+        self.assertNotIn("S100", self.manager.students)
+        self.assertIn("S100", self.on_disk()["12th"])
+        self.assertEqual(self.manager.manifest['shards']['12th']['count'], 11)
+
+    def test_add_new_shard(self):
+        self.assertTrue(self.manager.add_student("S100", "New", "9th"))
+        shards = self.on_disk()
+        self.assertEqual(list(shards["9th"]), ["S100"])
+
+    def test_move_between_shards(self):
+        generation = self.manager.manifest['shards']['11th']['generation']
+        self.assertTrue(self.manager.update_student("S000", grade="12th"))
+        self.assertNotIn("S000", self.manager.students)
+        shards = self.on_disk()
+        self.assertNotIn("S000", shards["10th"])
+        self.assertEqual(shards["12th"]["S000"]["grade"], "12th")
+        # Only the two shards involved are rewritten
+        self.assertEqual(self.manager.manifest['shards']['11th']['generation'], generation)
+
+    def test_update_within_shard(self):
+        self.assertTrue(self.manager.update_student("S003", name="Renamed"))
+        self.assertEqual(self.manager.students["S003"]["name"], "Renamed")
+        self.assertEqual(self.on_disk()["10th"]["S003"]["name"], "Renamed")
+
+    def test_delete(self):
+        self.assertTrue(self.manager.delete_student("S000"))
+        self.assertNotIn("S000", self.on_disk()["10th"])
+        # Only students in the view can be deleted
+        self.assertFalse(self.manager.delete_student("S001"))
+        self.assertIn("S001", self.on_disk()["11th"])
+
+    def test_duplicate_id_in_other_shard(self):
+        self.assertNotIn("S001", self.manager.students)
+        self.assertFalse(self.manager.add_student("S001", "Duplicate", "10th"))
+        self.assertFalse(self.manager.add_student("S001", "Duplicate", "9th"))
+        self.assertEqual(self.on_disk()["11th"]["S001"]["name"], "Student 1")
+        self.assertNotIn("9th", self.manager.manifest['shards'])
+
+    def test_duplicate_id_after_change_from_another_manager(self):
+        other = index.ShardedStudentManager(self.directory, view=["11th"])
+        try:
+            self.assertTrue(other.add_student("S200", "Elsewhere", "11th"))
+        finally:
+            other.close()
+        self.assertFalse(self.manager.add_student("S200", "Duplicate", "10th"))
+
+    def test_duplicate_id_hash_partition(self):
+        directory = os.path.join(self.tmp.name, "hashed")
+        manager = index.ShardedStudentManager.split(roster(), directory, partition='hash', buckets=4)
+        try:
+            manager.set_view([manager.shard_keys()[0]])
+            outside = next(sid for sid in roster() if sid not in manager.students)
+            self.assertFalse(manager.add_student(outside, "Duplicate", "10th"))
+            self.assertTrue(manager.add_student("S999", "New", "10th"))
+        finally:
+            manager.close()
+
+    def test_backup_of_narrowed_view(self):
+        backups = index.BackupManager(self.manager, os.path.join(self.tmp.name, "backups"))
+        full = backups.backup()
+        self.assertEqual(full['records'], 30)
+        self.manager.set_view(["11th"])
+        self.manager.update_student("S001", name="Renamed")
+        incremental = backups.backup()
+        self.assertEqual((incremental['records'], incremental['deleted']), (1, 0))
+        restored = backups.restore()
+        self.assertEqual(len(restored), 30)
+        self.assertEqual(restored["S001"]["name"], "Renamed")
+
+    def test_restore_repartitions_every_shard(self):
+        backups = index.BackupManager(self.manager, os.path.join(self.tmp.name, "backups"))
+        backups.backup()
+        # After the backup: move a student, add one in a new shard, delete one
+        self.manager.update_student("S000", grade="11th")
+        self.manager.add_student("S100", "New", "9th")
+        self.manager.delete_student("S003")
+
+        count = self.manager.commit_replace(self.manager.prepare_replace(backups.restore()))
+        self.assertEqual(count, 30)
+        # The shard created after the backup is left empty
+        self.assertEqual(self.on_disk(), {"9th": {}, **self.partition(roster())})
+        self.assertEqual(sorted(self.manager.students), sorted(self.partition(roster())["10th"]))
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.restore')], [])
+
+    def test_restore_through_save_data(self):
+        self.manager.students = roster()
+        self.manager.students["S001"] = dict(self.manager.students["S001"], grade="10th")
+        self.manager.save_data()
+        self.assertIn("S001", self.manager.students)
+        self.assertIn("S001", self.on_disk()["10th"])
+        self.assertNotIn("S001", self.on_disk()["11th"])
+
+    def test_id_sidecars(self):
+        self.manager.add_student("S100", "New", "12th")
+        path = self.manager._ids_file(self.manager._path("12th"))
+        with open(path, 'r') as f:
+            self.assertEqual(sorted(json.load(f)), sorted(self.on_disk()["12th"]))
+
+    def test_saved_view(self):
+        self.assertEqual(index.ShardedStudentManager.saved_view(self.directory), ["10th"])
+        self.manager.set_view(["12th"], remember=True)
+        self.assertEqual(index.ShardedStudentManager.saved_view(self.directory), ["12th"])
+        self.manager.set_view(None, remember=True)
+        self.assertIsNone(index.ShardedStudentManager.saved_view(self.directory))
+        self.assertEqual(len(self.manager.students), 30)
+
+    def test_search(self):
+        self.assertEqual([sid for sid, _ in self.manager.search_students("Student 1")],
+                         ["S012", "S015", "S018"])
+        found = self.manager.search_students("Student 1", all_shards=True)
+        self.assertEqual(sorted(sid for sid, _ in found), sorted(
+            sid for sid in roster() if "Student 1" in roster()[sid]["name"]))
+
+    def test_parallel_search(self):
+        manager = index.ShardedStudentManager(self.directory, view=["10th"], workers=1,
+                                              parallel_threshold=0)
+        try:
+            expected = self.manager.search_students("Student 2", all_shards=True)
+            self.assertEqual(sorted(manager.search_students("Student 2", all_shards=True)),
+                             sorted(expected))
+            self.assertEqual(manager.search_students("Student 2"),
+                             self.manager.search_students("Student 2"))
+        finally:
+            manager.close()
+
+
+if __name__ == '__main__':
+    unittest.main()